@@ -0,0 +1,315 @@
+import asyncio
+import logging
+from email import policy
+from email.utils import make_msgid
+
+import aiosmtplib
+
+from smtpmail import (SmtpMail, _address_header, _local_domain, _ssl_context, _stamp_headers, _validate_emails,
+                      _validate_one)
+
+logger = logging.getLogger(__name__)
+
+class _SharedConnection:
+    """
+    aiosmtplib session shared by the `AsyncSmtpMail` objects with the same server and account on one event loop.
+    """
+
+    def __init__(self, key, opening):
+        self.key     = key
+        self.opening = opening
+        self.users   = 0
+    # __init__ ( )
+
+    def alive(self):
+        """
+        Return True while the session is being opened or is open and usable.
+        """
+
+        if not self.opening.done():
+            return True
+        if self.opening.cancelled() or self.opening.exception() is not None:
+            return False
+        return self.opening.result().is_connected
+    # alive ( )
+# _SharedConnection
+
+# (event loop, server, port, credentials, SSL mode) -> _SharedConnection
+_SHARED = {}
+
+class AsyncSmtpMail(SmtpMail):
+    """
+    Asynchronous variant of `SmtpMail` built on `aiosmtplib`.
+
+    Message construction (`set_message`, `set_recipients`, `add_attachements`) is inherited from `SmtpMail`, while
+    `connect`, `disconnect`, `send` and `send_many` are coroutines that use non-blocking sockets, so sends to different
+    servers can run concurrently on the same event loop.
+    """
+
+    __slots__ = ("_shared",)
+
+    def __enter__(self):
+        raise TypeError("AsyncSmtpMail must be used with 'async with'")
+    # __enter__ ( )
+
+    async def __aenter__(self):
+        """
+        Connect to the SMTP server when entering an `async with` block.
+        """
+
+        await self.connect()
+        return self
+    # __aenter__ ( )
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Disconnect from the SMTP server when leaving an `async with` block.
+        """
+
+        await self.disconnect()
+    # __aexit__ ( )
+
+    async def connect(self):
+        """
+        Establish a connection to the SMTP server, using SSL or STARTTLS if configured, and log in.
+
+        Every `AsyncSmtpMail` with the same server, port, credentials and SSL mode on the same event loop shares one
+        session, so a batch of mailers can be sent with `asyncio.gather(*(m.send(False) for m in batch))` while paying
+        the TCP, TLS and login handshakes only once. Commands on the shared session are serialized by aiosmtplib.
+        """
+
+        logger.info("Attempting to connect to SMTP server: %s on port: %s", self.server_name, self.server_port)
+
+        key = (asyncio.get_running_loop(), self._pool_key())
+        shared = _SHARED.get(key)
+        if shared is None or not shared.alive():
+            shared = _SharedConnection(key, asyncio.ensure_future(self._open_async_connection()))
+            _SHARED[key] = shared
+        shared.users += 1
+
+        try:
+            self.smtpserver = await asyncio.shield(shared.opening)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            shared.users -= 1
+            if _SHARED.get(key) is shared:
+                del _SHARED[key]
+            logger.error("Connection error: %s", e)
+            return
+
+        self._shared = shared
+        self.connected = True
+        self.sent_count = 0
+        logger.info("Successfully connected to SMTP server: %s", self.server_name)
+    # connect ( )
+
+    async def _open_async_connection(self):
+        """
+        Open and authenticate a new aiosmtplib connection to the SMTP server.
+        """
+
+        server = aiosmtplib.SMTP(hostname=self.server_name, port=int(self.server_port),
+                                 use_tls=self.use_SSL, start_tls=not self.use_SSL, tls_context=_ssl_context())
+        await server.connect()
+        try:
+            await server.login(self.username, self.password)
+        except aiosmtplib.SMTPException:
+            server.close()
+            raise
+        return server
+    # _open_async_connection ( )
+
+    async def disconnect(self):
+        """
+        Leave the session with the SMTP server, closing it once no other mailer on this event loop is using it.
+        """
+
+        if self.connected:
+            self.connected = False
+            shared, self._shared = self._shared, None
+            shared.users -= 1
+            if shared.users > 0:
+                logger.info("Released shared connection to SMTP server.")
+                return
+            if _SHARED.get(shared.key) is shared:
+                del _SHARED[shared.key]
+            try:
+                await self.smtpserver.quit()
+                logger.info("Successfully disconnected from SMTP server.")
+            except aiosmtplib.SMTPException as e:
+                logger.error("Error disconnecting from SMTP server: %s", e)
+                self.smtpserver.close()
+    # disconnect ( )
+
+    async def send(self, close_connection=True):
+        """
+        Send the email to all specified recipients and optionally close the connection.
+
+        :param close_connection (boolean): Boolean to indicate if the SMTP connection should be closed after sending.
+        :raises ConnectionError: If not connected to the SMTP server.
+        :raises ValueError: If no recipients are specified.
+        """
+
+        if not self.connected:
+            logger.error("Not connected to any server. Call self.connect() before sending.")
+            raise ConnectionError("Not connected to any server. Try self.connect() first")
+
+        from_addr, full_recipients = self.envelope()
+
+        if not full_recipients:
+            logger.error("No recipients specified.")
+            raise ValueError("No recipients specified")
+
+        try:
+            await self.smtpserver.sendmail(from_addr, full_recipients, self.as_bytes())
+            self.sent_count += 1
+            logger.info("Email sent successfully to: %s", full_recipients)
+        except aiosmtplib.SMTPException as e:
+            logger.error("Failed to send email: %s", e)
+
+        if close_connection:
+            await self.disconnect()
+    # send ( )
+
+    async def send_templated(self, to, close_connection=True):
+        """
+        Send the current message to `to` only, reusing the template built by `freeze_template`.
+
+        :param to: List of recipients' email addresses (or a single address) for this copy.
+        :param close_connection (boolean): Boolean to indicate if the SMTP connection should be closed after sending.
+        :raises ConnectionError: If not connected to the SMTP server.
+        :raises ValueError: If no valid recipients are given.
+        """
+
+        if not self.connected:
+            logger.error("Not connected to any server. Call self.connect() before sending.")
+            raise ConnectionError("Not connected to any server. Try self.connect() first")
+
+        to = _validate_emails(to if isinstance(to, list) else [to])
+        recipients = list(dict.fromkeys(addr for address in to for addr in _validate_one(address)))
+        if not recipients:
+            logger.error("No recipients specified.")
+            raise ValueError("No recipients specified")
+
+        headers = _address_header('To', to).fold(policy=policy.SMTP) + "Message-ID: {}\r\n".format(
+            make_msgid(domain=_local_domain()))
+        try:
+            await self.smtpserver.sendmail(self.envelope()[0], recipients,
+                                           headers.encode("utf-8") + self.freeze_template())
+            self.sent_count += 1
+            logger.info("Email sent successfully to: %s", recipients)
+        except aiosmtplib.SMTPException as e:
+            logger.error("Failed to send email: %s", e)
+
+        if close_connection:
+            await self.disconnect()
+    # send_templated ( )
+
+    def send_bulk(self, messages, workers=8):
+        raise TypeError("AsyncSmtpMail does not support send_bulk; use send_many or send_fanout")
+    # send_bulk ( )
+
+    async def send_many(self, messages, close_connection=True):
+        """
+        Send several messages over a single authenticated SMTP session.
+
+        :param messages: Iterable of `EmailMessage` objects, each with its own From, To, CC and BCC headers, or of
+                         `(from_addr, recipients, msg_bytes)` tuples sent as they are.
+        :param close_connection (boolean): Boolean to indicate if the SMTP connection should be closed at the end.
+        :return: Number of messages sent successfully.
+        :raises ConnectionError: If the connection to the SMTP server could not be established.
+        """
+
+        if not self.connected:
+            await self.connect()
+
+        if not self.connected:
+            raise ConnectionError("Could not connect to server {}".format(self.server_name))
+
+        sent = 0
+        try:
+            for message in messages:
+                try:
+                    if isinstance(message, tuple):
+                        await self.smtpserver.sendmail(*message)
+                    else:
+                        _stamp_headers(message)
+                        await self.smtpserver.send_message(message)
+                    self.sent_count += 1
+                    sent += 1
+                except aiosmtplib.SMTPException as e:
+                    logger.error("Failed to send email: %s", e)
+        finally:
+            if close_connection:
+                await self.disconnect()
+
+        logger.info("Batch finished: %s message(s) sent.", sent)
+        return sent
+    # send_many ( )
+# AsyncSmtpMail
+
+async def send_fanout(mailers, close_connection=True):
+    """
+    Send the current message of every mailer concurrently, with one connection per distinct server and account.
+
+    Useful when the messages go to different servers (or different accounts): the total time is bounded by the
+    slowest server instead of the sum of all of them.
+
+    :param mailers: Iterable of `AsyncSmtpMail` objects with their message and recipients already set.
+    :param close_connection (boolean): Boolean to indicate if the connections should be closed after sending.
+    :return: List with one entry per mailer: None on success, or the exception that was raised.
+    """
+
+    async def _send(mailer):
+        if not mailer.connected:
+            await mailer.connect()
+        await mailer.send(close_connection)
+
+    return await asyncio.gather(*(_send(mailer) for mailer in mailers), return_exceptions=True)
+# send_fanout ( )
+
+async def verify_deliverability(addresses, concurrency=64):
+    """
+    Check that the domain of every address can receive mail, i.e. it has an MX (or, failing that, an A) record.
+
+    Message building never touches DNS; this helper is meant to be run separately over a whole recipient list. Each
+    domain is resolved once and up to `concurrency` lookups run in parallel. Lookups that fail for reasons other than a
+    missing domain or record (e.g. timeouts) count as deliverable, leaving the final word to the SMTP server.
+    Requires the optional `aiodns` package.
+
+    :param addresses: Iterable of email addresses, optionally with display names.
+    :param concurrency: Maximum number of DNS lookups in flight (default: 64).
+    :return: List with the addresses that are invalid or whose domain cannot receive mail.
+    """
+
+    # Imported here so aiodns is only required by callers of this helper.
+    import aiodns
+
+    resolver = aiodns.DNSResolver()
+    query = getattr(resolver, "query_dns", None) or resolver.query
+    missing = (aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _has_mail_host(domain):
+        async with semaphore:
+            for qtype in ("MX", "A"):
+                try:
+                    await query(domain, qtype)
+                    return True
+                except aiodns.error.DNSError as e:
+                    if e.args[0] not in missing:
+                        return True
+            return False
+
+    domains_by_address = {address: {addr.rpartition("@")[2].lower() for addr in _validate_one(address)}
+                          for address in addresses}
+    domains = list(set().union(*domains_by_address.values()))
+    deliverable = dict(zip(domains, await asyncio.gather(*(_has_mail_host(domain) for domain in domains))))
+
+    undeliverable = [address for address, address_domains in domains_by_address.items()
+                     if not address_domains or not all(deliverable[domain] for domain in address_domains)]
+    if undeliverable:
+        logger.warning("Undeliverable email addresses: %s", undeliverable)
+    return undeliverable
+# verify_deliverability ( )
+
+# EOF
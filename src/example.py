@@ -18,33 +18,34 @@ def main( ):
     if not username or not password:
         raise ValueError( "SMTP credentials not found. Check your .env file" )
 
-    # Initialize the email sending object
-    smtp_mail = SmtpMail( username, password, (server, port) )
-
-    # Connect to the server
-    smtp_mail.connect( )
-
-    # Set email content
-    smtp_mail.set_message(
-        subject= "Email Subject",
-        from_addr= "User <username@example.com>",
-        body_text= "<p>This is a test email sent using the <b>SmtpMail</b> class.</p>",
-        plaintext= "This is a test email sent using the SmtpMail class.",
-        attachment_paths= ["attachment.txt"]
-    )
-    
-    # Or you can add attachments separately
-    # smtp_mail.add_attachements( ["attachment.txt"] )
-
-    # Set recipients
-    smtp_mail.set_recipients(
-        to= ["to_recipient@example.com"],
-        cc= ["cc_recipient@example.com"],
-        bcc= ["bcc_recipient@example.com"]
-    )
-    
-    # Send the email
-    smtp_mail.send( )
+    # Initialize the email sending object; the "with" block connects once and disconnects at the end
+    with SmtpMail( username, password, (server, port) ) as smtp_mail:
+        messages = [ ]
+
+        for to in [ "first_recipient@example.com", "second_recipient@example.com" ]:
+            # Set email content
+            smtp_mail.set_message(
+                subject= "Email Subject",
+                from_addr= "User <username@example.com>",
+                body_text= "<p>This is a test email sent using the <b>SmtpMail</b> class.</p>",
+                plaintext= "This is a test email sent using the SmtpMail class.",
+                attachment_paths= ["attachment.txt"]
+            )
+
+            # Or you can add attachments separately
+            # smtp_mail.add_attachements( ["attachment.txt"] )
+
+            # Set recipients
+            smtp_mail.set_recipients(
+                to= [ to ],
+                cc= ["cc_recipient@example.com"],
+                bcc= ["bcc_recipient@example.com"]
+            )
+
+            messages.append( smtp_mail.msg )
+
+        # Send every message over the same connection
+        smtp_mail.send_many( messages )
 # main ( )
 
 if __name__ == "__main__":
@@ -1,15 +1,560 @@
+import io
+import os
+import base64
+import copy
+import mmap
+import stat
+import time
+import queue
+import atexit
+import socket
+import ssl
+import tempfile
 import smtplib
 import logging
+import mimetypes
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.generator import BytesGenerator
 from email.message import EmailMessage
-from email.utils import formatdate, COMMASPACE
-from pathlib import Path
+from email.utils import formatdate, getaddresses, make_msgid, COMMASPACE
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# Attachments larger than this are memory-mapped instead of read into a bytes object.
+_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Large attachments are base64-encoded this many bytes at a time (a whole number of 57-byte / 76-character lines).
+_BASE64_BLOCK = 57 * 1024
+
+# Flags used to open attachments: binary mode on Windows, and no blocking if a path names a FIFO instead of a file.
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_NONBLOCK", 0)
+
+# Maximum number of threads reading the files of one `add_attachements` call.
+_READ_WORKERS = 8
+
+# Messages whose attachments add up to more than this are spooled to a temporary file and sent with sendfile().
+_SENDFILE_THRESHOLD = 16 * 1024 * 1024
+
+# Seconds to wait for the server's reply to QUIT when closing a pooled connection.
+_CLOSE_TIMEOUT = 5
+
+# Send buffer requested for SMTP sockets.
+_SEND_BUFFER = 1 << 20
+
+@functools.lru_cache(maxsize=4096)
+def _validate_one(address):
+    """
+    Return the bare addresses (`user@domain`) in `address`, or an empty tuple if any of them is not valid.
+
+    `address` may hold several comma-separated addresses and display names with commas (`"Doe, John" <j@x.com>`),
+    which are parsed with `email.utils.getaddresses`. The check is syntactic only, with no DNS lookups (the server is
+    the judge of deliverability, see `asyncsmtpmail.verify_deliverability`), and results are memoized, since bulk
+    sends revalidate the same addresses many times. Entries with CR or LF are rejected, since they could inject
+    headers once written into the message.
+    """
+    
+    if "\r" in address or "\n" in address:
+        return ()
+    addrs = tuple(addr for _, addr in getaddresses([address]))
+    for addr in addrs:
+        local, _, domain = addr.rpartition("@")
+        if not local or not domain or " " in addr:
+            return ()
+    return addrs
+# _validate_one ( )
+
+def _validate_emails(addresses):
+    """
+    Filter out invalid email addresses, logging a single warning with all the ones ignored.
+
+    :param addresses: List of email addresses, optionally with display names ("Name <user@domain>").
+    :return: List with the valid addresses, unchanged and in the original order.
+    """
+    
+    valid = []
+    invalid = []
+    for address in addresses:
+        if _validate_one(address):
+            valid.append(address)
+        else:
+            invalid.append(address)
+            
+    if invalid:
+        logger.warning("Invalid email addresses ignored: %s", invalid)
+    return valid
+# _validate_emails ( )
+
+@functools.lru_cache(maxsize=None)
+def _local_domain():
+    """
+    Return the fully qualified domain name of this host, resolved only once per process.
+    """
+    
+    return socket.getfqdn()
+# _local_domain ( )
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context():
+    """
+    Return the TLS context shared by every connection.
+
+    Loading the CA certificates is the most expensive step of importing this module, so it is deferred to the first
+    connection, and then done once per process instead of per handshake.
+    """
+    
+    return ssl.create_default_context()
+# _ssl_context ( )
+
+@functools.lru_cache(maxsize=None)
+def _ext_ctypes():
+    """
+    Return the extension -> content type lookup table used for attachments, built on first use.
+
+    Reading the system MIME tables is deferred until a message actually has attachments, and the table lets them
+    skip the generic `mimetypes.guess_type` path.
+    """
+    
+    mimetypes.init()
+    return {
+        ".csv":  "text/csv",
+        ".pdf":  "application/pdf",
+        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        **mimetypes.types_map,
+    }
+# _ext_ctypes ( )
+
+def _stamp_headers(msg):
+    """
+    Add the Date and Message-ID headers to `msg` if missing.
+
+    Called right before sending, so queued messages carry their real send time and the host name lookup is kept out
+    of message construction.
+
+    :return: Tuple with the names of the headers that were added.
+    """
+    
+    added = ()
+    if 'Date' not in msg:
+        msg['Date'] = formatdate(localtime=True)
+        added += ('Date',)
+    if 'Message-ID' not in msg:
+        msg['Message-ID'] = make_msgid(domain=_local_domain())
+        added += ('Message-ID',)
+    return added
+# _stamp_headers ( )
+
+def _tune_socket(sock):
+    """
+    Disable Nagle's algorithm, enlarge the send buffer and enable TCP keepalive on an SMTP connection's socket.
+
+    SMTP is a series of short command / reply turns, which Nagle can delay by tens of milliseconds each, and a larger
+    send buffer lets big DATA writes proceed without waiting for the kernel to drain it. Keepalive lets the kernel
+    notice a peer that vanished while the session sat idle in the pool.
+    """
+    
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SEND_BUFFER)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError as e:
+        logger.debug("Could not tune the SMTP socket: %s", e)
+# _tune_socket ( )
+
+def _address_header(name, addresses):
+    """
+    Return the parsed `name` header listing `addresses`, or None if there are none.
+
+    `EmailMessage` stores a parsed header object as it is, so a header built here once can be assigned to any number
+    of messages without parsing and validating the address list again.
+    """
+    
+    if not addresses:
+        return None
+    return policy.default.header_factory(name, COMMASPACE.join(addresses))
+# _address_header ( )
+
+def _read_attachment(path):
+    """
+    Read the file at `path` for `SmtpMail.add_attachements`.
+
+    :param path: Path of the file.
+    :return: Tuple `(name, ctype, content)`, where `content` is a bytes object, or a read-only `mmap` (to be closed by
+             the caller) for files larger than `_MMAP_THRESHOLD`; None if the file does not exist or cannot be read.
+    """
+    
+    # One open() and one fstat() on the descriptor both check the file and give its size
+    try:
+        fd = os.open(path, _OPEN_FLAGS)
+    except OSError:
+        logger.warning("File not found: %s", path)
+        return None
+    
+    name = os.path.basename(path)
+    try:
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode):
+            logger.warning("File not found: %s", path)
+            return None
+
+        ctype = _ext_ctypes().get(os.path.splitext(name)[1].lower())
+        if ctype is None:
+            ctype, encoding = mimetypes.guess_type(name, strict=False)
+            # A compressed file (e.g. ".tar.gz") is sent as opaque binary, not as its inner type
+            if ctype is None or encoding is not None:
+                ctype = "application/octet-stream"
+                
+        if info.st_size > _MMAP_THRESHOLD:
+            content = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        else:
+            content = os.read(fd, info.st_size)
+        return name, ctype, content
+    except Exception as e:
+        logger.error("Failed to add attachment %s: %s", name, e)
+        return None
+    finally:
+        os.close(fd)
+# _read_attachment ( )
+
+class _DotStuffingWriter:
+    """
+    Minimal file-like writer that applies SMTP dot-stuffing (RFC 5321, section 4.5.2) to everything written to it.
+    """
+    
+    def __init__(self, file):
+        self.file = file
+        self.at_line_start = True
+    # __init__ ( )
+
+    def write(self, data):
+        if not data:
+            return
+        data = data.replace(b"\n.", b"\n..")
+        if self.at_line_start and data[:1] == b".":
+            data = b"." + data
+        self.at_line_start = data[-1:] == b"\n"
+        self.file.write(data)
+    # write ( )
+# _DotStuffingWriter
+
+class PipelinedSMTP(smtplib.SMTP):
+    """
+    SMTP connection that uses ESMTP PIPELINING (RFC 2920) when the server advertises it.
+
+    MAIL FROM, every RCPT TO and DATA are written in a single packet and their replies are read back-to-back, so the
+    envelope costs one round-trip instead of one per command. Servers without PIPELINING use the regular path.
+    """
+    
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        """
+        Send `msg` to `to_addrs`, pipelining the envelope commands when possible.
+
+        Same signature, return value and exceptions as `smtplib.SMTP.sendmail`.
+        """
+        
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining") or any(option.lower() == "smtputf8" for option in mail_options):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode("ascii")
+
+        senderrs = self._start_data(from_addr, to_addrs, len(msg), mail_options, rcpt_options)
+        payload = smtplib._quote_periods(msg)
+        if payload[-2:] != smtplib.bCRLF:
+            payload += smtplib.bCRLF
+        self.send(payload + b"." + smtplib.bCRLF)
+        return self._finish_data(senderrs)
+    # sendmail ( )
+
+    def sendmail_from_file(self, from_addr, to_addrs, file, mail_options=(), rcpt_options=()):
+        """
+        Send a message stored in `file` to `to_addrs`, streaming it with `socket.sendfile`.
+
+        On plain sockets the kernel copies the file straight to the connection; on TLS sockets it is sent in chunks,
+        so the message is never held in memory as a whole either way.
+
+        :param file: Binary file holding the message, with CRLF line endings and already dot-stuffed.
+        :return: Dictionary with the refused recipients, as `sendmail`.
+        """
+        
+        self.ehlo_or_helo_if_needed()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(0)
+
+        senderrs = self._start_data(from_addr, to_addrs, size, mail_options, rcpt_options)
+        try:
+            self.sock.sendfile(file)
+        except OSError:
+            # Same handling as smtplib.SMTP.send, so callers see an SMTPException and the socket is not left open
+            self.close()
+            raise smtplib.SMTPServerDisconnected("Server not connected")
+        self.send(b"." + smtplib.bCRLF)
+        return self._finish_data(senderrs)
+    # sendmail_from_file ( )
+
+    def _start_data(self, from_addr, to_addrs, size, mail_options, rcpt_options):
+        """
+        Run MAIL FROM, RCPT TO and DATA (pipelined if supported), leaving the server waiting for the message data.
+
+        :return: Dictionary with the refused recipients.
+        :raises SMTPSenderRefused, SMTPRecipientsRefused, SMTPDataError: As `smtplib.SMTP.sendmail`.
+        """
+        
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        mail_options = list(mail_options)
+        if self.has_extn("size"):
+            mail_options.append("size=%d" % size)
+
+        if not self.has_extn("pipelining"):
+            code, resp = self.mail(from_addr, mail_options)
+            if code != 250:
+                if code == 421:
+                    self.close()
+                else:
+                    self._rset()
+                raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+            senderrs = {}
+            for addr in to_addrs:
+                code, resp = self.rcpt(addr, rcpt_options)
+                if code not in (250, 251):
+                    senderrs[addr] = (code, resp)
+                if code == 421:
+                    self.close()
+                    raise smtplib.SMTPRecipientsRefused(senderrs)
+            if len(senderrs) == len(to_addrs):
+                self._rset()
+                raise smtplib.SMTPRecipientsRefused(senderrs)
+            self.putcmd("data")
+            code, resp = self.getreply()
+            if code != 354:
+                self._rset()
+                raise smtplib.SMTPDataError(code, resp)
+            return senderrs
+
+        commands = [self._format_command("MAIL", "FROM:%s" % smtplib.quoteaddr(from_addr), mail_options)]
+        commands.extend(self._format_command("RCPT", "TO:%s" % smtplib.quoteaddr(addr), rcpt_options)
+                        for addr in to_addrs)
+        commands.append(self._format_command("DATA"))
+        self.send("".join(commands))
+
+        # Every pipelined command gets a reply, so read them all before acting on any failure.
+        mail_code, mail_resp = self.getreply()
+        senderrs = {}
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                senderrs[addr] = (code, resp)
+        data_code, data_resp = self.getreply()
+
+        refused = mail_code != 250 or len(senderrs) == len(to_addrs)
+        if data_code == 354 and refused:
+            # Some servers accept DATA even with no valid recipient; close the empty transaction.
+            self.send(b"." + smtplib.bCRLF)
+            self.getreply()
+        if mail_code != 250:
+            self._rset()
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(senderrs) == len(to_addrs):
+            self._rset()
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if data_code != 354:
+            self._rset()
+            raise smtplib.SMTPDataError(data_code, data_resp)
+        return senderrs
+    # _start_data ( )
+
+    def _finish_data(self, senderrs):
+        """
+        Read the reply to the end of the message data.
+        """
+        
+        code, resp = self.getreply()
+        if code != 250:
+            if code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+    # _finish_data ( )
+
+    def _format_command(self, cmd, args="", options=()):
+        """
+        Build one CRLF-terminated command line, as `putcmd` would send it.
+        """
+        
+        if options and self.does_esmtp:
+            args = "{} {}".format(args, " ".join(options))
+        line = "{} {}".format(cmd, args).strip()
+        if "\r" in line or "\n" in line:
+            raise ValueError("command and arguments contain prohibited newline characters")
+        return line + smtplib.CRLF
+    # _format_command ( )
+# PipelinedSMTP
+
+class PipelinedSMTP_SSL(PipelinedSMTP, smtplib.SMTP_SSL):
+    """
+    `PipelinedSMTP` over an implicit TLS connection (SMTPS, usually port 465), as `smtplib.SMTP_SSL`.
+    """
+# PipelinedSMTP_SSL
+
+class SmtpConnectionPool:
+    """
+    Pool of authenticated SMTP connections, keyed by server, port, credentials and SSL mode.
+
+    `SmtpMail` objects share a process-wide default pool; pass another instance to `SmtpMail(pool=...)` to isolate a
+    group of mailers or to tune its limits.
+
+    Released connections are kept for reuse (at most `max_per_key` per key) and a background thread closes those idle
+    for more than `idle_timeout` seconds (which must be greater than 0). Connections are probed with NOOP before being
+    handed out again, and idle ones are closed at exit, waiting at most a few seconds for each server to answer QUIT.
+    """
+    
+    def __init__(self, max_per_key=4, idle_timeout=100):
+        if idle_timeout <= 0:
+            raise ValueError("idle_timeout must be greater than 0, got {}".format(idle_timeout))
+        self.max_per_key  = max_per_key
+        self.idle_timeout = idle_timeout
+        self._idle        = {}
+        self._lock        = threading.Lock()
+        self._reaper      = None
+        _POOLS.add(self)
+    # __init__ ( )
+
+    def acquire(self, key, factory):
+        """
+        Return a live pooled connection for `key`, or a new one built by calling `factory()`.
+        """
+        
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                conn, _ = idle.pop()
+            if self._is_alive(conn):
+                logger.debug("Reusing pooled SMTP connection.")
+                return conn
+            self._close(conn)
+        return factory()
+    # acquire ( )
+
+    def release(self, key, conn):
+        """
+        Return `conn` to the pool for later reuse, or close it if the pool for `key` is full.
+        """
+        
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_key:
+                idle.append((conn, time.monotonic()))
+                self._start_reaper()
+                return
+        self._close(conn)
+    # release ( )
+
+    def close_all(self):
+        """
+        Close every idle connection in the pool.
+        """
+        
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                self._close(conn)
+    # close_all ( )
+
+    def _start_reaper(self):
+        # Called with the lock held. The thread only holds a weak reference, so it does not keep the pool alive.
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, args=(weakref.ref(self),), name="smtp-pool-reaper",
+                                            daemon=True)
+            self._reaper.start()
+    # _start_reaper ( )
+
+    @staticmethod
+    def _reap(pool_ref):
+        while True:
+            pool = pool_ref()
+            if pool is None:
+                return
+            interval = pool.idle_timeout / 4
+            del pool
+            time.sleep(interval)
+            
+            pool = pool_ref()
+            if pool is None:
+                return
+            deadline = time.monotonic() - pool.idle_timeout
+            expired = []
+            with pool._lock:
+                for idle in pool._idle.values():
+                    expired.extend(conn for conn, released in idle if released < deadline)
+                    idle[:] = [(conn, released) for conn, released in idle if released >= deadline]
+            del pool
+            for conn in expired:
+                SmtpConnectionPool._close(conn)
+    # _reap ( )
+
+    @staticmethod
+    def _is_alive(conn):
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    # _is_alive ( )
+
+    @staticmethod
+    def _close(conn):
+        try:
+            # Bounded wait for the QUIT reply, so a peer that silently went away cannot hang the caller (or exit)
+            if conn.sock is not None:
+                conn.sock.settimeout(_CLOSE_TIMEOUT)
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+    # _close ( )
+# SmtpConnectionPool
+
+# Every live pool, so their idle connections are closed at exit without the exit hook keeping them alive.
+_POOLS = weakref.WeakSet()
+
+@atexit.register
+def _close_pools():
+    for pool in list(_POOLS):
+        pool.close_all()
+# _close_pools ( )
+
+_POOL = SmtpConnectionPool()
 
 class SmtpMail:
     """
     Class for sending emails using SMTP, with support for SSL and TLS encryption.
     """
     
-    def __init__(self, in_username, in_password, in_server=("smtp.gmail.com", 587), use_SSL=False):
+    # Recycle the session after this many messages; some servers drop long-lived connections.
+    MAX_MESSAGES_PER_CONNECTION = 10000
+    
+    # Check the session with a NOOP before sending if it has been idle this many seconds; servers drop idle clients.
+    IDLE_PROBE_SECONDS = 30
+    
+    # Fixed attribute layout: no per-instance __dict__, which matters when one object is created per email.
+    __slots__ = ("username", "password", "server_name", "server_port", "use_SSL", "pool", "connected", "sent_count",
+                 "smtpserver", "_last_used", "msg", "_all", "_to_end", "_cc_end", "_to_header", "_cc_header",
+                 "_bcc_header", "_recipients_key", "_envelope_from", "_envelope_recipients", "_serialized",
+                 "_serialized_text", "_spooled", "_envelope", "_template", "_stamped", "_attachment_bytes")
+    
+    def __init__(self, in_username, in_password, in_server=("smtp.gmail.com", 587), use_SSL=False, pool=None):
         """
         Initialize the SmtpMail object for sending emails.
 
@@ -17,6 +562,7 @@ class SmtpMail:
         :param in_password (str): SMTP server password for authentication.
         :param in_server: Tuple with SMTP server address and port (default: Gmail server and port).
         :param use_SSL: Boolean indicating whether to use SSL (default: False).
+        :param pool: `SmtpConnectionPool` to take connections from (default: the process-wide pool).
         """
         
         self.username    = in_username
@@ -24,10 +570,28 @@ class SmtpMail:
         self.server_name = in_server[0]
         self.server_port = in_server[1]
         self.use_SSL     = use_SSL
+        self.pool        = pool if pool is not None else _POOL
         self.connected   = False
-        self.recipients  = {"To": [], "CC": [], "BCC": []}
+        self.sent_count  = 0
+        self._last_used  = 0.0
+        self._all        = []
+        self._to_end     = 0
+        self._cc_end     = 0
+        self._to_header  = None
+        self._cc_header  = None
+        self._bcc_header = None
+        self._recipients_key = None
+        self._envelope_from = ""
+        self._envelope_recipients = []
+        self._serialized = None
+        self._serialized_text = None
+        self._spooled = None
+        self._envelope = None
+        self._template = None
+        self._stamped = ()
+        self._attachment_bytes = 0
         
-        logging.info("SmtpMail initialized with server: {} and port: {}".format(self.server_name, self.server_port))
+        logger.info("SmtpMail initialized with server: %s and port: %s", self.server_name, self.server_port)
     # __init__ ( )
 
     def __str__(self):
@@ -40,44 +604,127 @@ class SmtpMail:
                f"Connected: {self.connected} \n" \
                f"Username: {self.username}"
     # __str__ ( )
+
+    def __enter__(self):
+        """
+        Connect to the SMTP server when entering a `with` block.
+        """
+        
+        self.connect()
+        return self
+    # __enter__ ( )
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Disconnect from the SMTP server when leaving a `with` block.
+        """
+        
+        self.disconnect()
+    # __exit__ ( )
     
     def connect(self):
         """
         Establish a connection to the SMTP server, using SSL or TLS if configured.
 
-        If `use_SSL` is True, connect with SSL. Otherwise, connect normally and start TLS.
+        An idle authenticated connection to the same server and account is taken from the process-wide pool when
+        available; otherwise a new one is opened. If `use_SSL` is True, connect with SSL. Otherwise, connect normally
+        and start TLS.
         """
         
-        logging.info("Attempting to connect to SMTP server: {} on port: {}".format(self.server_name, self.server_port))
+        logger.info("Attempting to connect to SMTP server: %s on port: %s", self.server_name, self.server_port)
         
         try:
-            if self.use_SSL:
-                self.smtpserver = smtplib.SMTP_SSL(self.server_name, self.server_port)
-                logging.debug("Using SSL for connection.")
-            else:
-                self.smtpserver = smtplib.SMTP(self.server_name, self.server_port)
-                self.smtpserver.starttls()
-                logging.debug("Using TLS for connection.")
-                
-            self.smtpserver.login(self.username, self.password)
+            self.smtpserver = self.pool.acquire(self._pool_key(), self._open_connection)
             self.connected = True
-            logging.info("Successfully connected to SMTP server: {}".format(self.server_name))
+            self.sent_count = 0
+            self._last_used = time.monotonic()
+            logger.info("Successfully connected to SMTP server: %s", self.server_name)
         except smtplib.SMTPException as e:
-            logging.error(f"Connection error: {e}")
+            logger.error("Connection error: %s", e)
     # connect ( )
 
-    def disconnect(self):
+    def _ensure_live(self):
+        """
+        Make sure the session is still usable before sending, reconnecting if the server dropped it.
+
+        Only sessions idle for `IDLE_PROBE_SECONDS` or more are probed (with a NOOP), so back-to-back sends pay nothing,
+        while the first send after a long gap does not fail on a closed socket.
+        """
+        
+        now = time.monotonic()
+        if now - self._last_used >= self.IDLE_PROBE_SECONDS:
+            try:
+                alive = self.smtpserver.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                alive = False
+            if not alive:
+                logger.warning("Connection to %s went stale, reconnecting.", self.server_name)
+                self._reconnect()
+        self._last_used = now
+    # _ensure_live ( )
+
+    def _reconnect(self):
         """
-        Terminate the connection with the SMTP server, closing the session.
+        Replace the current connection with a new one.
+
+        Network errors (refused connection, DNS failure) are logged like SMTP errors, leaving the object disconnected,
+        so the sending methods keep logging failed messages instead of raising.
+        """
+        
+        self.disconnect(discard=True)
+        try:
+            self.connect()
+        except OSError as e:
+            logger.error("Connection error: %s", e)
+    # _reconnect ( )
+
+    def _open_connection(self):
+        """
+        Open and authenticate a new connection to the SMTP server.
+        """
+        
+        if self.use_SSL:
+            server = PipelinedSMTP_SSL(self.server_name, self.server_port, context=_ssl_context())
+            _tune_socket(server.sock)
+            logger.debug("Using SSL for connection.")
+        else:
+            server = PipelinedSMTP(self.server_name, self.server_port)
+            _tune_socket(server.sock)
+            server.starttls(context=_ssl_context())
+            logger.debug("Using TLS for connection.")
+            
+        try:
+            server.login(self.username, self.password)
+        except smtplib.SMTPException:
+            server.close()
+            raise
+        return server
+    # _open_connection ( )
+
+    def _pool_key(self):
+        return (self.server_name, self.server_port, self.username, self.password, self.use_SSL)
+    # _pool_key ( )
+
+    def disconnect(self, discard=False):
+        """
+        Terminate the session with the SMTP server.
+
+        The connection is handed back to the process-wide pool so a later `connect()` can reuse it without a new
+        handshake; idle pooled connections are closed after 100 seconds.
+
+        :param discard (boolean): Close the connection instead of returning it to the pool.
         """
         
         if self.connected:
             try:
-                self.smtpserver.close()
+                if discard:
+                    self.smtpserver.close()
+                else:
+                    self.pool.release(self._pool_key(), self.smtpserver)
                 self.connected = False
-                logging.info("Successfully disconnected from SMTP server.")
+                logger.info("Successfully disconnected from SMTP server.")
             except Exception as e:
-                logging.error("Error disconnecting from SMTP server: {}".format(e))
+                logger.error("Error disconnecting from SMTP server: %s", e)
     # disconnect ( )
 
     def set_message(self, subject, from_addr=None, body_text=None, plaintext=None, attachment_paths=None):
@@ -89,77 +736,280 @@ class SmtpMail:
         :param body_text: Main body of the email (HTML or plain text).
         :param plaintext: Alternative plain text for clients that don't support HTML.
         :param attachment_path: Path to an attachment file, if any.
+        
+        Recipients configured by `set_recipients` are kept, so one recipient list can be reused for several messages.
         """
         
         self.msg = EmailMessage()
-        self.msg['Subject'] = subject
-        self.msg['From'] = from_addr if from_addr else self.username
-        self.msg['Date'] = formatdate(localtime=True)
-        self.msg['List-Unsubscribe'] = '<mailto:leconni@leconni.com>, <https://leconni.com.br/>'
+        self._attachment_bytes = 0
+        self._invalidate()
+        self.set_headers({
+            'Subject': subject,
+            'From': from_addr if from_addr else self.username,
+            'List-Unsubscribe': '<mailto:leconni@leconni.com>, <https://leconni.com.br/>',
+            'To': self._to_header,
+            'CC': self._cc_header,
+            'BCC': self._bcc_header,
+        })
         
         if plaintext:
             self.msg.set_content(plaintext)
-            logging.debug("Plaintext content set.")
+            logger.debug("Plaintext content set.")
             
         if body_text:
             self.msg.add_alternative(body_text, subtype="html")
-            logging.debug("HTML content set.")
+            logger.debug("HTML content set.")
 
         self.add_attachements(attachment_paths)
     # set_message ( )
     
+    def set_headers(self, headers):
+        """
+        Set several headers of the current message in one call, replacing any previous value.
+        
+        :param headers: Dictionary (or iterable of pairs) mapping header names to values; None removes the header.
+        """
+        
+        msg = self.msg
+        self._invalidate()
+        items = headers.items() if hasattr(headers, "items") else headers
+        for name, value in items:
+            del msg[name]
+            if value is not None:
+                msg[name] = value
+            # The bare sender address is parsed once here instead of from the From header on every send
+            if name.lower() == "from":
+                self._envelope_from = getaddresses([str(value)])[0][1] if value is not None else ""
+    # set_headers ( )
+    
     def add_attachements(self, attachment_paths=None):
         """ 
         Adds attachments to the email message. 
         
         :param attachment_path: Path to an attachment file, if any.
         """
-        if attachment_paths:
-            for path in attachment_paths:
-                attachment = Path(path)
-                if attachment.is_file():
+        if not attachment_paths:
+            return
+        
+        # Files are read by a few threads at once so their disk reads overlap (file I/O releases the GIL), while
+        # the message itself is only touched here, in the original order, since `email` is not thread-safe
+        paths = list(attachment_paths)
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(paths))) as executor:
+                attachments = list(executor.map(_read_attachment, paths))
+        else:
+            attachments = [_read_attachment(path) for path in paths]
+            
+        for attachment in attachments:
+            if attachment is None:
+                continue
+            name, ctype, content = attachment
+            try:
+                if isinstance(content, mmap.mmap):
                     try:
-                        with attachment.open("rb") as file:
-                            self.msg.add_attachment(file.read(), maintype="application", subtype="octet-stream", filename=attachment.name)
-                        logging.info(f"Attachment added: {attachment.name}")
-                    except Exception as e:
-                        logging.error(f"Failed to add attachment {attachment.name}: {e}")
+                        with memoryview(content) as view:
+                            self._attach(view, name, ctype)
+                    finally:
+                        content.close()
                 else:
-                    logging.warning(f"File not found: {path}")
+                    self._attach(content, name, ctype)
+                logger.info("Attachment added: %s", name)
+            except Exception as e:
+                logger.error("Failed to add attachment %s: %s", name, e)
     # add_attachmentes ( )
 
+    def _attach(self, content, filename, ctype="application/octet-stream"):
+        """
+        Add `content` (bytes or a buffer such as a memory-mapped file) to the message as an attachment.
+        
+        :param content: Attachment data.
+        :param filename: File name shown to the recipient.
+        :param ctype: MIME content type of the attachment (default: application/octet-stream).
+        """
+        
+        maintype, subtype = ctype.split("/", 1)
+        self._attachment_bytes += len(content)
+        self._invalidate()
+        if len(content) <= _MMAP_THRESHOLD:
+            # ASCII text passed as str lets the email package pick 7bit (or quoted-printable for long lines) instead
+            # of always paying base64's 33% overhead. Non-ASCII text would get 8bit, which needs BODY=8BITMIME, so it
+            # stays on the base64 path. The str path sends every line with a CRLF ending, so it is only taken when
+            # this leaves the file byte-identical: it already ends with CRLF and has no bare CR or LF
+            data = bytes(content)
+            if (maintype == "text" and data[-2:] == b"\r\n" and data.isascii()
+                    and data.count(b"\r") == data.count(b"\n") == data.count(b"\r\n")):
+                self.msg.add_attachment(data.decode("ascii"), subtype=subtype, filename=filename)
+                return
+            self.msg.add_attachment(content, maintype=maintype, subtype=subtype, filename=filename)
+            return
+            
+        # Encode large contents block by block into a single payload string instead of letting the email package
+        # build one string per 76-character line, which cuts the peak memory of this step by about a third
+        encoded = "".join(base64.encodebytes(content[i:i + _BASE64_BLOCK]).decode("ascii")
+                          for i in range(0, len(content), _BASE64_BLOCK))
+        self.msg.add_attachment(b"", maintype=maintype, subtype=subtype, filename=filename)
+        self.msg.get_payload()[-1].set_payload(encoded)
+    # _attach ( )
+
     def set_recipients(self, to=None, cc=None, bcc=None):
         """
-        Specify recipients for the email.
+        Specify recipients for the email. Invalid addresses are ignored with a warning.
 
         :param to: List of primary recipients' email addresses.
         :param cc: List of CC recipients' email addresses (optional).
         :param bcc: List of BCC recipients' email addresses (optional).
         """
         
+        # Repeating the previous call (e.g. once per message in a campaign loop) changes nothing, since `set_message`
+        # keeps the recipient headers, so the validation and header rewrite are skipped
+        key = tuple(tuple(value) if isinstance(value, list) else value for value in (to, cc, bcc))
+        if key == self._recipients_key:
+            return
+        self._recipients_key = key
+        
+        current = dict(self.recipients)
         if to:
-            self.recipients["To"] = to if isinstance(to, list) else [to]
-            logging.debug("To recipients set.")
+            current["To"] = _validate_emails(to if isinstance(to, list) else [to])
+            logger.debug("To recipients set.")
         if cc:
-            self.recipients["CC"] = cc if isinstance(cc, list) else [cc]
-            logging.debug("CC recipients set.")
+            current["CC"] = _validate_emails(cc if isinstance(cc, list) else [cc])
+            logger.debug("CC recipients set.")
         if bcc:
-            self.recipients["BCC"] = bcc if isinstance(bcc, list) else [bcc]
-            logging.debug("BCC recipients set.")
+            current["BCC"] = _validate_emails(bcc if isinstance(bcc, list) else [bcc])
+            logger.debug("BCC recipients set.")
 
-        # Set email headers for recipients
-        self.msg['To'] = COMMASPACE.join(self.recipients["To"])
-        
-        if self.recipients["CC"]:
-            self.msg['CC'] = COMMASPACE.join(self.recipients["CC"])
-            
-        if self.recipients["BCC"]:
-            self.msg['BCC'] = COMMASPACE.join(self.recipients["BCC"])
+        # All recipients live in one flat list, To first, then CC, then BCC, split by the two end indices
+        self._all = [*current["To"], *current["CC"], *current["BCC"]]
+        self._to_end = len(current["To"])
+        self._cc_end = self._to_end + len(current["CC"])
+
+        # Envelope addresses are computed once here instead of on every send; dict.fromkeys drops duplicates
+        # (an address both in To and CC gets a single RCPT) while keeping the original order
+        self._envelope_recipients = list(dict.fromkeys(addr for address in self._all
+                                                       for addr in _validate_one(address)))
+
+        # Headers are parsed once here and reused by the following `set_message` calls
+        self._to_header = _address_header('To', current["To"])
+        self._cc_header = _address_header('CC', current["CC"])
+        self._bcc_header = _address_header('BCC', current["BCC"])
+        self.set_headers({'To': self._to_header, 'CC': self._cc_header, 'BCC': self._bcc_header})
             
-        logging.info("Recipients configured. To: {}, CC: {}, BCC: {}".format(
-            self.recipients["To"], self.recipients["CC"], self.recipients["BCC"]))
+        logger.info("Recipients configured. To: %s, CC: %s, BCC: %s", current["To"], current["CC"], current["BCC"])
     # set_recipients ( )
 
+    @property
+    def recipients(self):
+        """
+        Read-only mapping with the To, CC and BCC recipients configured by `set_recipients`, as given (display names
+        included). Each value is a tuple, so changes must go through `set_recipients`.
+        """
+        
+        return MappingProxyType({"To": tuple(self._all[:self._to_end]),
+                                 "CC": tuple(self._all[self._to_end:self._cc_end]),
+                                 "BCC": tuple(self._all[self._cc_end:])})
+    # recipients ( )
+
+    def get_recipients(self):
+        """
+        Return the envelope addresses (To, CC and BCC) of the current message.
+        
+        :return: List of bare email addresses, as configured by `set_recipients`.
+        """
+        
+        return self._envelope_recipients
+    # get_recipients ( )
+
+    def envelope(self):
+        """
+        Return the SMTP envelope of the current message.
+        
+        Both parts are parsed when the From header and the recipients are set, so sending does not look up or parse
+        any header.
+        
+        :return: Tuple `(from_addr, recipients)` with the bare sender address and the list of recipient addresses.
+        """
+        
+        if self._envelope is None:
+            self._envelope = (self._envelope_from, self._envelope_recipients)
+        return self._envelope
+    # envelope ( )
+
+    def as_bytes(self):
+        """
+        Return the current message serialized as it goes on the wire: CRLF line endings, Date and Message-ID set and no
+        BCC header.
+
+        The result is cached until the message is changed through this class, so retries and repeated sends do not
+        re-encode the body and attachments.
+        """
+        
+        if self._serialized is None:
+            buffer = io.BytesIO()
+            BytesGenerator(buffer, policy=policy.SMTP).flatten(self._wire_message())
+            self._serialized = buffer.getvalue()
+        return self._serialized
+    # as_bytes ( )
+
+    def as_string(self):
+        """
+        Return the current message as text, exactly as `as_bytes` but decoded.
+
+        It shares the `as_bytes` cache, so a message that is printed or logged and then sent is flattened only once.
+        """
+        
+        if self._serialized_text is None:
+            self._serialized_text = self.as_bytes().decode("utf-8", "surrogateescape")
+        return self._serialized_text
+    # as_string ( )
+
+    def _spool(self):
+        """
+        Return a temporary file holding the current message ready for the DATA phase (CRLF and dot-stuffed).
+
+        The file is written once and kept until the message changes, like the cache of `as_bytes`.
+        """
+        
+        if self._spooled is None:
+            spooled = tempfile.TemporaryFile()
+            writer = _DotStuffingWriter(spooled)
+            BytesGenerator(writer, policy=policy.SMTP).flatten(self._wire_message())
+            if not writer.at_line_start:
+                writer.write(smtplib.bCRLF)
+            self._spooled = spooled
+        return self._spooled
+    # _spool ( )
+
+    def _wire_message(self):
+        """
+        Return a copy of the current message as it must be sent: Date and Message-ID set and no BCC header.
+        """
+        
+        self._stamped += _stamp_headers(self.msg)
+        msg = copy.copy(self.msg)
+        del msg['BCC']
+        return msg
+    # _wire_message ( )
+
+    def _invalidate(self):
+        """
+        Drop the serialized copies and the envelope of the current message after it has been changed.
+
+        Date and Message-ID headers stamped by `_wire_message` are removed too, so the next copy sent (e.g. to other
+        recipients) gets its own send time and Message-ID; headers set by the caller are kept.
+        """
+        
+        for name in self._stamped:
+            del self.msg[name]
+        self._stamped = ()
+        self._serialized = None
+        self._serialized_text = None
+        self._envelope = None
+        self._template = None
+        if self._spooled is not None:
+            self._spooled.close()
+            self._spooled = None
+    # _invalidate ( )
+
     def send(self, close_connection=True):
         """
         Send the email to all specified recipients and optionally close the connection.
@@ -170,24 +1020,269 @@ class SmtpMail:
         """
         
         if not self.connected:
-            logging.error("Not connected to any server. Call self.connect() before sending.")
+            logger.error("Not connected to any server. Call self.connect() before sending.")
             raise ConnectionError("Not connected to any server. Try self.connect() first")
 
-        full_recipients = self.recipients["To"] + self.recipients["CC"] + self.recipients["BCC"]
+        from_addr, full_recipients = self.envelope()
         
         if not full_recipients:
-            logging.error("No recipients specified.")
+            logger.error("No recipients specified.")
             raise ValueError("No recipients specified")
 
         try:
-            self.smtpserver.sendmail(self.msg['From'], full_recipients, self.msg.as_string())
-            logging.info("Email sent successfully to: {}".format(full_recipients))
+            self._ensure_live()
+            if self._attachment_bytes > _SENDFILE_THRESHOLD and hasattr(self.smtpserver, "sendmail_from_file"):
+                self.smtpserver.sendmail_from_file(from_addr, full_recipients, self._spool())
+            else:
+                self.smtpserver.sendmail(from_addr, full_recipients, self.as_bytes())
+            self.sent_count += 1
+            logger.info("Email sent successfully to: %s", full_recipients)
         except smtplib.SMTPException as e:
-            logging.error(f"Failed to send email: {e}")
+            logger.error("Failed to send email: %s", e)
         
         if close_connection:
             self.disconnect()
     # send ( )
+
+    def freeze_template(self):
+        """
+        Serialize the current message once as a template for `send_templated`.
+
+        The template holds everything but the To, CC and Message-ID headers, so sending it to a new recipient only
+        prepends those header lines instead of building and encoding the message again. It is kept until the message
+        is changed.
+
+        :return: The template bytes (CRLF line endings, no BCC header).
+        """
+        
+        if self._template is None:
+            msg = self._wire_message()
+            del msg['To']
+            del msg['CC']
+            del msg['Message-ID']
+            buffer = io.BytesIO()
+            BytesGenerator(buffer, policy=policy.SMTP).flatten(msg)
+            self._template = buffer.getvalue()
+        return self._template
+    # freeze_template ( )
+
+    def send_templated(self, to, close_connection=True):
+        """
+        Send the current message to `to` only, reusing the template built by `freeze_template`.
+
+        Meant for campaigns that send the same message to many recipients one at a time: each call costs a header line
+        and a socket write, with no MIME construction. The recipients configured by `set_recipients` are not used.
+
+        :param to: List of recipients' email addresses (or a single address) for this copy.
+        :param close_connection (boolean): Boolean to indicate if the SMTP connection should be closed after sending.
+        :raises ConnectionError: If not connected to the SMTP server.
+        :raises ValueError: If no valid recipients are given.
+        """
+        
+        if not self.connected:
+            logger.error("Not connected to any server. Call self.connect() before sending.")
+            raise ConnectionError("Not connected to any server. Try self.connect() first")
+
+        to = _validate_emails(to if isinstance(to, list) else [to])
+        recipients = list(dict.fromkeys(addr for address in to for addr in _validate_one(address)))
+        if not recipients:
+            logger.error("No recipients specified.")
+            raise ValueError("No recipients specified")
+
+        headers = _address_header('To', to).fold(policy=policy.SMTP) + "Message-ID: {}\r\n".format(
+            make_msgid(domain=_local_domain()))
+        try:
+            self._ensure_live()
+            self.smtpserver.sendmail(self.envelope()[0], recipients,
+                                     headers.encode("utf-8") + self.freeze_template())
+            self.sent_count += 1
+            logger.info("Email sent successfully to: %s", recipients)
+        except smtplib.SMTPException as e:
+            logger.error("Failed to send email: %s", e)
+        
+        if close_connection:
+            self.disconnect()
+    # send_templated ( )
+
+    def send_many(self, messages, close_connection=True):
+        """
+        Send several messages over a single authenticated SMTP session.
+
+        The connection is opened once (if needed) and reused for every message. If the server drops it mid-batch,
+        it is re-established once and the message is retried. The session is also recycled every
+        `MAX_MESSAGES_PER_CONNECTION` messages.
+
+        Messages may also be given already serialized as `(from_addr, recipients, msg_bytes)` tuples, which are sent
+        as they are: no header parsing or flattening, and MAIL FROM / RCPT TO are pipelined when the server allows it.
+
+        :param messages: Iterable of `EmailMessage` objects, each with its own From, To, CC and BCC headers, or of
+                         `(from_addr, recipients, msg_bytes)` tuples.
+        :param close_connection (boolean): Boolean to indicate if the SMTP connection should be closed at the end.
+        :return: Number of messages sent successfully.
+        :raises ConnectionError: If the connection to the SMTP server could not be established.
+        """
+        
+        if not self.connected:
+            self.connect()
+            
+        if not self.connected:
+            raise ConnectionError("Could not connect to server {}".format(self.server_name))
+
+        sent = 0
+        try:
+            for message in messages:
+                if self.sent_count >= self.MAX_MESSAGES_PER_CONNECTION:
+                    logger.info("Recycling connection after %s messages.", self.sent_count)
+                    self._reconnect()
+                    
+                if self._send_message(message):
+                    sent += 1
+        finally:
+            if close_connection:
+                self.disconnect()
+                
+        logger.info("Batch finished: %s message(s) sent.", sent)
+        return sent
+    # send_many ( )
+
+    def send_bulk(self, messages, workers=8):
+        """
+        Send many messages in parallel, each worker thread holding its own pooled connection.
+
+        Sending is bound by network round-trips, so several connections overlap them and throughput grows with
+        `workers` up to the server's concurrency limit. A worker whose connection drops reconnects and retries the
+        message once. The batch is aborted once a third of the messages have failed, or as soon as a connection cannot
+        be opened or logged in. This method does not use (or need) the connection opened by `connect()`.
+
+        :param messages: Iterable of `EmailMessage` objects, each with its own From, To, CC and BCC headers.
+        :param workers: Maximum number of worker threads and simultaneous connections (default: 8).
+        :return: Number of messages sent successfully.
+        :raises ValueError: If `workers` is less than 1.
+        """
+        
+        if workers < 1:
+            raise ValueError("workers must be at least 1, got {}".format(workers))
+        
+        pending = queue.SimpleQueue()
+        total = 0
+        for message in messages:
+            pending.put(message)
+            total += 1
+            
+        key = self._pool_key()
+        lock = threading.Lock()
+        abort = threading.Event()
+        connect_lock = threading.Lock()
+        logged_in = threading.Event()
+        failed = 0
+
+        def _fail(error):
+            nonlocal failed
+            logger.error("Failed to send email: %s", error)
+            with lock:
+                failed += 1
+                if failed * 3 >= total and not abort.is_set():
+                    logger.error("Aborting bulk send: %s of %s messages failed.", failed, total)
+                    abort.set()
+
+        def _connect():
+            try:
+                return self.pool.acquire(key, self._open_connection)
+            except (smtplib.SMTPException, OSError) as e:
+                with lock:
+                    if not abort.is_set():
+                        logger.error("Aborting bulk send: could not connect to %s: %s", self.server_name, e)
+                        abort.set()
+                return None
+
+        def _acquire():
+            # A connection that cannot be opened or logged in fails the same way for every worker, and retrying per
+            # message would only get the account throttled: the first failure stops the whole batch. Until one login
+            # has succeeded, workers open their connections one at a time, and a failure sets `abort` before the lock
+            # is released, so a bad password costs a single attempt
+            if logged_in.is_set():
+                return _connect()
+            with connect_lock:
+                if abort.is_set():
+                    return None
+                conn = _connect()
+                if conn is not None:
+                    logged_in.set()
+                return conn
+
+        def _worker():
+            sent = 0
+            conn = None
+            try:
+                while not abort.is_set():
+                    try:
+                        message = pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    _stamp_headers(message)
+                    for attempt in range(2):
+                        if conn is None:
+                            conn = _acquire()
+                            if conn is None:
+                                return sent
+                        try:
+                            conn.send_message(message)
+                            sent += 1
+                            break
+                        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError) as e:
+                            if conn is not None:
+                                conn.close()
+                                conn = None
+                            if attempt:
+                                _fail(e)
+                        except smtplib.SMTPException as e:
+                            _fail(e)
+                            break
+            finally:
+                if conn is not None:
+                    self.pool.release(key, conn)
+            return sent
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, total))) as executor:
+            futures = [executor.submit(_worker) for _ in range(min(workers, total))]
+        sent = sum(future.result() for future in futures)
+        
+        logger.info("Bulk send finished: %s of %s message(s) sent.", sent, total)
+        return sent
+    # send_bulk ( )
+
+    def _send_message(self, message):
+        """
+        Send a single message on the current connection, reconnecting once if the server went away.
+
+        :param message: The `EmailMessage` or `(from_addr, recipients, msg_bytes)` tuple to send.
+        :return: True if the message was accepted by the server, False otherwise.
+        """
+        
+        for attempt in range(2):
+            if not self.connected:
+                logger.error("Not connected to any server, message skipped.")
+                return False
+            try:
+                self._ensure_live()
+                if isinstance(message, tuple):
+                    self.smtpserver.sendmail(*message)
+                else:
+                    _stamp_headers(message)
+                    self.smtpserver.send_message(message)
+                self.sent_count += 1
+                return True
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as e:
+                if attempt:
+                    logger.error("Failed to send email after reconnecting: %s", e)
+                    return False
+                logger.warning("Connection lost (%s), reconnecting.", e)
+                self._reconnect()
+            except smtplib.SMTPException as e:
+                logger.error("Failed to send email: %s", e)
+                return False
+        return False
+    # _send_message ( )
 # SmtpMail
 
 # EOF
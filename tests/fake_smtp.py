@@ -0,0 +1,171 @@
+import os
+import socket
+import sys
+import threading
+from contextlib import contextmanager
+from unittest import mock
+
+# The modules under test live in src/, which is not an installed package.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import smtpmail
+
+class FakeSmtpServer:
+    """
+    Minimal SMTP server on a local port, for tests.
+
+    It speaks enough ESMTP for `SmtpMail`: EHLO (optionally advertising PIPELINING), AUTH PLAIN, MAIL, RCPT, DATA,
+    RSET, NOOP and QUIT. Every accepted message is stored in `messages` as `(from_addr, recipients, data)`, with the
+    data un-dot-stuffed and its CRLF line endings kept. STARTTLS is not supported; use `no_starttls()`.
+
+    :param pipelining: Advertise ESMTP PIPELINING (default: True).
+    :param refuse_senders: Addresses refused in MAIL FROM with a 550 reply.
+    :param refuse_recipients: Addresses refused in RCPT TO with a 550 reply.
+    :param fail_login: Reject every AUTH attempt with a 535 reply.
+    """
+
+    def __init__(self, pipelining=True, refuse_senders=(), refuse_recipients=(), fail_login=False):
+        self.pipelining        = pipelining
+        self.refuse_senders    = set(refuse_senders)
+        self.refuse_recipients = set(refuse_recipients)
+        self.fail_login        = fail_login
+        self.messages          = []
+        self.connections       = 0
+        self.logins            = 0
+        self._lock             = threading.Lock()
+        self._listener         = socket.create_server(("127.0.0.1", 0))
+        self.port              = self._listener.getsockname()[1]
+        self._clients          = []
+        threading.Thread(target=self._accept, daemon=True).start()
+    # __init__ ( )
+
+    def close(self):
+        """
+        Stop listening and drop every open client connection.
+        """
+
+        self._listener.close()
+        for client in list(self._clients):
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.close()
+    # close ( )
+
+    def drop_clients(self):
+        """
+        Close every open client connection without a reply, as a server restarting or timing out would.
+        """
+
+        for client in list(self._clients):
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    # drop_clients ( )
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            self._clients.append(client)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+    # _accept ( )
+
+    def _serve(self, client):
+        stream = client.makefile("rb")
+
+        def reply(line):
+            client.sendall(line.encode("ascii") + b"\r\n")
+
+        sender = None
+        recipients = []
+        try:
+            reply("220 fake ESMTP")
+            for raw in stream:
+                line = raw.rstrip(b"\r\n").decode("utf-8", "replace")
+                verb, _, arg = line.partition(" ")
+                verb = verb.upper()
+                if verb == "EHLO":
+                    reply("250-fake")
+                    reply("250-AUTH PLAIN")
+                    if self.pipelining:
+                        reply("250-PIPELINING")
+                    reply("250 HELP")
+                elif verb == "HELO":
+                    reply("250 fake")
+                elif verb == "AUTH":
+                    with self._lock:
+                        self.logins += 1
+                    reply("535 authentication failed" if self.fail_login else "235 authenticated")
+                elif verb == "MAIL":
+                    address = _address(arg)
+                    if address in self.refuse_senders:
+                        reply("550 sender refused")
+                    else:
+                        sender, recipients = address, []
+                        reply("250 ok")
+                elif verb == "RCPT":
+                    address = _address(arg)
+                    if sender is None:
+                        reply("503 need MAIL first")
+                    elif address in self.refuse_recipients:
+                        reply("550 recipient refused")
+                    else:
+                        recipients.append(address)
+                        reply("250 ok")
+                elif verb == "DATA":
+                    if sender is None or not recipients:
+                        reply("554 no valid recipients")
+                        continue
+                    reply("354 go ahead")
+                    data = []
+                    for data_line in stream:
+                        if data_line == b".\r\n":
+                            break
+                        data.append(data_line[1:] if data_line.startswith(b".") else data_line)
+                    with self._lock:
+                        self.messages.append((sender, recipients, b"".join(data)))
+                    sender, recipients = None, []
+                    reply("250 queued")
+                elif verb == "RSET":
+                    sender, recipients = None, []
+                    reply("250 ok")
+                elif verb == "NOOP":
+                    reply("250 ok")
+                elif verb == "QUIT":
+                    reply("221 bye")
+                    break
+                else:
+                    reply("502 not implemented")
+        except OSError:
+            pass
+        finally:
+            stream.close()
+            client.close()
+            if client in self._clients:
+                self._clients.remove(client)
+    # _serve ( )
+# FakeSmtpServer
+
+def _address(arg):
+    # "FROM:<a@x.com> SIZE=10" -> "a@x.com"
+    return arg.partition(":")[2].split(" ", 1)[0].strip("<>")
+# _address ( )
+
+@contextmanager
+def no_starttls():
+    """
+    Make STARTTLS a no-op, since `FakeSmtpServer` speaks plain text only.
+    """
+
+    with mock.patch.object(smtpmail.PipelinedSMTP, "starttls", lambda self, **kwargs: (220, b"ready")):
+        yield
+# no_starttls ( )
+
+# EOF
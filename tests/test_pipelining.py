@@ -0,0 +1,135 @@
+import io
+import smtplib
+import tempfile
+import unittest
+
+from fake_smtp import FakeSmtpServer
+
+import smtpmail
+
+class RecordingSMTP(smtpmail.PipelinedSMTP):
+    """
+    `PipelinedSMTP` that records every chunk written to the socket.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.chunks = []
+        super().__init__(*args, **kwargs)
+    # __init__ ( )
+
+    def send(self, s):
+        self.chunks.append(s if isinstance(s, bytes) else s.encode("ascii"))
+        super().send(s)
+    # send ( )
+# RecordingSMTP
+
+MESSAGE = b"Subject: test\r\n\r\nline one\r\n.leading dot\r\n..two dots\r\n"
+
+class PipelinedSMTPTest(unittest.TestCase):
+
+    def connect(self, **server_options):
+        server = FakeSmtpServer(**server_options)
+        self.addCleanup(server.close)
+        conn = RecordingSMTP("127.0.0.1", server.port)
+        self.addCleanup(conn.close)
+        return server, conn
+    # connect ( )
+
+    def test_pipelined_envelope_is_sent_in_one_write(self):
+        server, conn = self.connect(pipelining=True)
+        refused = conn.sendmail("from@x.com", ["a@x.com", "b@x.com"], MESSAGE)
+
+        self.assertEqual(refused, {})
+        envelope = [chunk for chunk in conn.chunks if b"MAIL FROM" in chunk]
+        self.assertEqual(len(envelope), 1)
+        self.assertIn(b"RCPT TO:<a@x.com>", envelope[0])
+        self.assertIn(b"RCPT TO:<b@x.com>", envelope[0])
+        self.assertTrue(envelope[0].endswith(b"DATA\r\n"))
+        self.assertEqual(server.messages, [("from@x.com", ["a@x.com", "b@x.com"], MESSAGE)])
+    # test_pipelined_envelope_is_sent_in_one_write ( )
+
+    def test_sequential_envelope_without_pipelining(self):
+        server, conn = self.connect(pipelining=False)
+        refused = conn.sendmail("from@x.com", ["a@x.com", "b@x.com"], MESSAGE)
+
+        self.assertEqual(refused, {})
+        self.assertFalse(any(b"MAIL FROM" in chunk and b"RCPT TO" in chunk for chunk in conn.chunks))
+        self.assertEqual(server.messages, [("from@x.com", ["a@x.com", "b@x.com"], MESSAGE)])
+    # test_sequential_envelope_without_pipelining ( )
+
+    def test_refused_sender(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                server, conn = self.connect(pipelining=pipelining, refuse_senders={"bad@x.com"})
+                with self.assertRaises(smtplib.SMTPSenderRefused):
+                    conn.sendmail("bad@x.com", ["a@x.com"], MESSAGE)
+
+                # The session is still usable after the failed transaction
+                conn.sendmail("from@x.com", ["a@x.com"], MESSAGE)
+                self.assertEqual([message[0] for message in server.messages], ["from@x.com"])
+    # test_refused_sender ( )
+
+    def test_some_recipients_refused(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                server, conn = self.connect(pipelining=pipelining, refuse_recipients={"b@x.com"})
+                refused = conn.sendmail("from@x.com", ["a@x.com", "b@x.com"], MESSAGE)
+
+                self.assertEqual(list(refused), ["b@x.com"])
+                self.assertEqual(refused["b@x.com"][0], 550)
+                self.assertEqual(server.messages, [("from@x.com", ["a@x.com"], MESSAGE)])
+    # test_some_recipients_refused ( )
+
+    def test_all_recipients_refused(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                server, conn = self.connect(pipelining=pipelining, refuse_recipients={"a@x.com", "b@x.com"})
+                with self.assertRaises(smtplib.SMTPRecipientsRefused) as raised:
+                    conn.sendmail("from@x.com", ["a@x.com", "b@x.com"], MESSAGE)
+
+                self.assertEqual(set(raised.exception.recipients), {"a@x.com", "b@x.com"})
+                conn.sendmail("from@x.com", ["c@x.com"], MESSAGE)
+                self.assertEqual(server.messages, [("from@x.com", ["c@x.com"], MESSAGE)])
+    # test_all_recipients_refused ( )
+
+    def test_sendmail_from_file(self):
+        server, conn = self.connect()
+        spool = io.BytesIO()
+        writer = smtpmail._DotStuffingWriter(spool)
+        writer.write(MESSAGE)
+
+        with tempfile.TemporaryFile() as file:
+            file.write(spool.getvalue())
+            file.seek(0)
+            conn.sendmail_from_file("from@x.com", ["a@x.com"], file)
+        self.assertEqual(server.messages, [("from@x.com", ["a@x.com"], MESSAGE)])
+    # test_sendmail_from_file ( )
+# PipelinedSMTPTest
+
+class DotStuffingWriterTest(unittest.TestCase):
+
+    def stuff(self, *chunks):
+        buffer = io.BytesIO()
+        writer = smtpmail._DotStuffingWriter(buffer)
+        for chunk in chunks:
+            writer.write(chunk)
+        return buffer.getvalue()
+    # stuff ( )
+
+    def test_dots_at_line_start_are_doubled(self):
+        self.assertEqual(self.stuff(b".a\r\nb.\r\n..c\r\n"), b"..a\r\nb.\r\n...c\r\n")
+    # test_dots_at_line_start_are_doubled ( )
+
+    def test_line_start_is_tracked_across_writes(self):
+        data = b"a\r\n.b\r\nc\r\n.\r\n"
+        expected = b"a\r\n..b\r\nc\r\n..\r\n"
+        for split in range(1, len(data)):
+            with self.subTest(split=split):
+                self.assertEqual(self.stuff(data[:split], b"", data[split:]), expected)
+    # test_line_start_is_tracked_across_writes ( )
+# DotStuffingWriterTest
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF
@@ -0,0 +1,101 @@
+import gc
+import time
+import unittest
+import weakref
+
+from fake_smtp import FakeSmtpServer, no_starttls
+
+import smtpmail
+
+class SmtpConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeSmtpServer()
+        self.addCleanup(self.server.close)
+        patcher = no_starttls()
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+    # setUp ( )
+
+    def mailer(self, pool):
+        return smtpmail.SmtpMail("me@x.com", "secret", ("127.0.0.1", self.server.port), pool=pool)
+    # mailer ( )
+
+    def test_connection_is_reused(self):
+        pool = smtpmail.SmtpConnectionPool()
+        self.addCleanup(pool.close_all)
+        mail = self.mailer(pool)
+
+        mail.connect()
+        first = mail.smtpserver
+        mail.disconnect()
+        mail.connect()
+        self.assertIs(mail.smtpserver, first)
+        mail.disconnect()
+
+        # A second mailer with the same server and credentials shares the session too
+        other = self.mailer(pool)
+        other.connect()
+        self.assertIs(other.smtpserver, first)
+        other.disconnect()
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.logins, 1)
+    # test_connection_is_reused ( )
+
+    def test_dead_connection_is_replaced(self):
+        pool = smtpmail.SmtpConnectionPool()
+        self.addCleanup(pool.close_all)
+        mail = self.mailer(pool)
+        mail.connect()
+        first = mail.smtpserver
+        mail.disconnect()
+
+        self.server.drop_clients()
+        time.sleep(0.1)
+        mail.connect()
+        self.assertIsNot(mail.smtpserver, first)
+        mail.disconnect()
+        self.assertEqual(self.server.connections, 2)
+    # test_dead_connection_is_replaced ( )
+
+    def test_idle_connections_are_reaped(self):
+        pool = smtpmail.SmtpConnectionPool(idle_timeout=0.2)
+        self.addCleanup(pool.close_all)
+        mail = self.mailer(pool)
+        mail.connect()
+        first = mail.smtpserver
+        mail.disconnect()
+
+        deadline = time.monotonic() + 5
+        while any(pool._idle.values()) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(any(pool._idle.values()))
+
+        mail.connect()
+        self.assertIsNot(mail.smtpserver, first)
+        mail.disconnect()
+    # test_idle_connections_are_reaped ( )
+
+    def test_pool_is_collected(self):
+        pool = smtpmail.SmtpConnectionPool(idle_timeout=0.2)
+        mail = self.mailer(pool)
+        mail.connect()
+        mail.disconnect()
+
+        ref = weakref.ref(pool)
+        del mail, pool
+        gc.collect()
+        self.assertIsNone(ref())
+    # test_pool_is_collected ( )
+
+    def test_idle_timeout_must_be_positive(self):
+        for idle_timeout in (0, -1):
+            with self.subTest(idle_timeout=idle_timeout), self.assertRaises(ValueError):
+                smtpmail.SmtpConnectionPool(idle_timeout=idle_timeout)
+    # test_idle_timeout_must_be_positive ( )
+# SmtpConnectionPoolTest
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF
@@ -0,0 +1,117 @@
+import email
+import unittest
+from email import policy
+from unittest import mock
+
+from fake_smtp import FakeSmtpServer, no_starttls
+
+import smtpmail
+
+class SmtpMailTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeSmtpServer()
+        self.addCleanup(self.server.close)
+        self.pool = smtpmail.SmtpConnectionPool()
+        self.addCleanup(self.pool.close_all)
+        patcher = no_starttls()
+        patcher.__enter__()
+        self.addCleanup(patcher.__exit__, None, None, None)
+    # setUp ( )
+
+    def mailer(self):
+        mail = smtpmail.SmtpMail("me@x.com", "secret", ("127.0.0.1", self.server.port), pool=self.pool)
+        mail.connect()
+        self.assertTrue(mail.connected)
+        return mail
+    # mailer ( )
+
+    def received(self, index=0):
+        sender, recipients, data = self.server.messages[index]
+        return sender, recipients, email.message_from_bytes(data, policy=policy.default)
+    # received ( )
+
+    def test_send(self):
+        mail = self.mailer()
+        mail.set_message("Hello", plaintext="body")
+        mail.set_recipients(to=["a@x.com"], cc=["b@x.com"], bcc=["c@x.com"])
+        mail.send()
+
+        sender, recipients, msg = self.received()
+        self.assertEqual(sender, "me@x.com")
+        self.assertEqual(recipients, ["a@x.com", "b@x.com", "c@x.com"])
+        self.assertEqual(msg["Subject"], "Hello")
+        self.assertIsNone(msg["Bcc"])
+        self.assertEqual(msg.get_content().strip(), "body")
+    # test_send ( )
+
+    def test_sendfile_path_keeps_dots_across_write_boundaries(self):
+        # Lines starting with a dot land at every offset relative to the spool's write boundaries
+        body = "".join(".{}\n{}\n..\n".format("x" * n, "y" * n) for n in range(200))
+        mail = self.mailer()
+        mail.set_message("Dots", plaintext=body)
+        mail.set_recipients(to=["a@x.com"])
+        sendfile = mock.patch.object(smtpmail.PipelinedSMTP, "sendmail_from_file",
+                                     autospec=True, side_effect=smtpmail.PipelinedSMTP.sendmail_from_file)
+        with mock.patch.object(smtpmail, "_SENDFILE_THRESHOLD", -1), sendfile as spy:
+            mail.send()
+
+        spy.assert_called_once()
+        _, _, msg = self.received()
+        self.assertEqual(msg.get_content().replace("\r\n", "\n").rstrip("\n"), body.rstrip("\n"))
+        self.assertEqual(self.server.messages[0][2], mail.as_bytes())
+    # test_sendfile_path_keeps_dots_across_write_boundaries ( )
+
+    def test_send_templated_encodes_headers(self):
+        mail = self.mailer()
+        mail.set_message("Hello", plaintext="body")
+        mail.set_recipients(to=["ignored@x.com"])
+        mail.send_templated("José Müller <t1@x.com>", close_connection=False)
+        mail.send_templated(['"Doe, J" <t2@x.com>', "t3@x.com"])
+
+        first, second = self.server.messages
+        self.assertEqual(first[1], ["t1@x.com"])
+        self.assertEqual(second[1], ["t2@x.com", "t3@x.com"])
+
+        to_line = next(line for line in first[2].split(b"\r\n") if line.startswith(b"To:"))
+        self.assertTrue(to_line.isascii())
+        self.assertIn(b"=?utf-8?", to_line)
+
+        first_msg = email.message_from_bytes(first[2], policy=policy.default)
+        second_msg = email.message_from_bytes(second[2], policy=policy.default)
+        self.assertEqual(first_msg["To"].addresses[0].display_name, "José Müller")
+        self.assertEqual([address.addr_spec for address in second_msg["To"].addresses], ["t2@x.com", "t3@x.com"])
+        self.assertNotEqual(first_msg["Message-ID"], second_msg["Message-ID"])
+        self.assertEqual(first_msg["Subject"], "Hello")
+    # test_send_templated_encodes_headers ( )
+
+    def test_send_templated_rejects_header_injection(self):
+        mail = self.mailer()
+        mail.set_message("Hello", plaintext="body")
+        with self.assertRaises(ValueError):
+            mail.send_templated("a@x.com\r\nBcc: evil@x.com")
+        self.assertEqual(self.server.messages, [])
+        mail.disconnect()
+    # test_send_templated_rejects_header_injection ( )
+
+    def test_send_bulk_stops_after_failed_login(self):
+        server = FakeSmtpServer(fail_login=True)
+        self.addCleanup(server.close)
+        mail = smtpmail.SmtpMail("me@x.com", "wrong", ("127.0.0.1", server.port), pool=self.pool)
+        messages = []
+        for n in range(50):
+            message = email.message.EmailMessage()
+            message["From"] = "me@x.com"
+            message["To"] = "a{}@x.com".format(n)
+            message.set_content("body")
+            messages.append(message)
+
+        self.assertEqual(mail.send_bulk(messages, workers=4), 0)
+        self.assertEqual(server.logins, 1)
+    # test_send_bulk_stops_after_failed_login ( )
+# SmtpMailTest
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF